@@ -1,16 +1,29 @@
 import json
+import math
 import random
 import csv
 import os
-from collections import defaultdict
+import sys
+from collections import Counter, defaultdict
 from typing import List, Tuple, Dict
 
+import archive
+from problem import attach_student_groups, compile_timeslots, compute_lower_bound, count_clashes
+
 # Konfigurasi Parameter Awal 
 POPULATION_SIZE = 100
 NUM_GENERATIONS = 200
 TOURNAMENT_SIZE = 3
 CROSSOVER_RATE = 0.8
 ELITISM = True
+ARCHIVE_SEED_FRACTION = 0.2   # Porsi populasi awal yang diambil dari arsip elite
+
+# Monitoring diversity populasi
+DIVERSITY_THRESHOLD = 0.05    # Rata-rata Hamming distance (fraksi gen) di bawah ini = konvergen prematur
+MUTATION_BOOST = 3.0          # Pengali mutation rate saat diversity rendah
+MAX_MUTATION_RATE = 0.2
+RESTART_PATIENCE = 10         # Generasi diversity rendah berturut-turut sebelum restart parsial
+RESTART_FRACTION = 0.5        # Porsi individu terburuk yang diganti individu random
 
 # MUTATION RATE akan dihitung otomatis berdasarkan panjang kromosom (L)
 # (biar tidak None dan tidak crash)
@@ -43,18 +56,11 @@ def load_data():
     with open("dataset/matkul.json", "r", encoding="utf-8") as f:
         matkul_list = json.load(f)
 
-    timeslots = []
-    for i, s in enumerate(sesi_list):
-        timeslots.append(
-            {
-                "index": i,
-                "day": s["day"],
-                "session": s["session"],
-                "start": s["start"],
-                "end": s["end"],
-                "type": s["type"],  # 3 untuk 3 SKS (panjang), 2 untuk 2 SKS (pendek)
-            }
-        )
+    with open("dataset/jadwalmentah.json", "r", encoding="utf-8") as f:
+        jadwal_mentah = json.load(f)
+
+    timeslots = compile_timeslots(sesi_list)
+    attach_student_groups(matkul_list, jadwal_mentah)
 
     return timeslots, ruang_list, matkul_list
 
@@ -88,7 +94,17 @@ def create_random_individual(timeslots, ruang_list, matkul_list) -> List[Tuple[i
 
 
 def initialize_population(pop_size, timeslots, ruang_list, matkul_list):
-    return [create_random_individual(timeslots, ruang_list, matkul_list) for _ in range(pop_size)]
+    # Sebagian populasi dari arsip solusi elite run sebelumnya, sisanya random
+    population = archive.load_seeds(
+        timeslots,
+        ruang_list,
+        matkul_list,
+        int(pop_size * ARCHIVE_SEED_FRACTION),
+        lambda: create_random_individual(timeslots, ruang_list, matkul_list),
+    )
+    while len(population) < pop_size:
+        population.append(create_random_individual(timeslots, ruang_list, matkul_list))
+    return population
 
 
 # =========================
@@ -98,15 +114,15 @@ def compute_penalty(individual, timeslots, ruang_list, matkul_list) -> int:
     """Hitung total penalty (semakin kecil semakin baik)."""
     penalty = 0
 
-    used_room: Dict[Tuple[str, int, str], List[int]] = defaultdict(list)
-    used_dosen: Dict[Tuple[str, int, str], List[int]] = defaultdict(list)
+    used_room: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    used_dosen: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    used_group: Dict[Tuple[int, str], List[int]] = defaultdict(list)
 
     for i, gene in enumerate(individual):
         ts_index, room_index = gene
         mk = matkul_list[i]
         ts = timeslots[ts_index]
 
-        day = ts["day"]
         session = ts["session"]
         room = ruang_list[room_index]
 
@@ -121,23 +137,24 @@ def compute_penalty(individual, timeslots, ruang_list, matkul_list) -> int:
             penalty += 3
 
         # Simpan penggunaan ruangan
-        used_room[(day, session, room)].append(i)
+        used_room[(ts_index, room)].append(i)
 
         # Simpan penggunaan dosen
         for d in mk["dosen"]:
-            used_dosen[(day, session, d)].append(i)
+            used_dosen[(ts_index, d)].append(i)
 
-    # Hard Const: Konflik ruangan
-    for _, kelas_idx in used_room.items():
-        if len(kelas_idx) > 1:
-            conflict_count = len(kelas_idx) - 1
-            penalty += 10 * conflict_count
+        # Simpan penggunaan kelompok mahasiswa
+        for g in mk["groups"]:
+            used_group[(ts_index, g)].append(i)
 
-    # Hard Const: Konflik dosen
-    for _, kelas_idx in used_dosen.items():
-        if len(kelas_idx) > 1:
-            conflict_count = len(kelas_idx) - 1
-            penalty += 8 * conflict_count
+    # Hard Const: Konflik ruangan (termasuk slot yang waktunya overlap)
+    penalty += 10 * count_clashes(used_room, timeslots)
+
+    # Hard Const: Konflik dosen (termasuk slot yang waktunya overlap)
+    penalty += 8 * count_clashes(used_dosen, timeslots)
+
+    # Hard Const: Konflik kelompok mahasiswa (prodi + semester + kelas yang sama)
+    penalty += 8 * count_clashes(used_group, timeslots)
 
     return penalty
 
@@ -147,6 +164,31 @@ def compute_fitness(individual, timeslots, ruang_list, matkul_list) -> Tuple[flo
     return 1.0 / (1.0 + penalty), penalty
 
 
+# =========================
+# Diversity Populasi
+# =========================
+def population_diversity(population) -> Tuple[float, float]:
+    """
+    Return (rata-rata Hamming distance antar pasangan / L, rata-rata entropy per gen).
+    Dihitung per kolom gen dari frekuensi nilai: pasangan berbeda di gen j
+    = (P^2 - sum c_v^2) / 2, jadi cukup O(P*L) tanpa membandingkan semua pasangan.
+    """
+    P = len(population)
+    if P < 2 or not population[0]:
+        return 0.0, 0.0
+
+    L = len(population[0])
+    different_pairs = 0
+    entropy = 0.0
+
+    for column in zip(*population):
+        counts = Counter(column).values()
+        different_pairs += (P * P - sum(c * c for c in counts)) // 2
+        entropy -= sum((c / P) * math.log(c / P) for c in counts)
+
+    return different_pairs / (P * (P - 1) / 2) / L, entropy / L
+
+
 # =========================
 # Seleksi Individu
 # =========================
@@ -184,31 +226,60 @@ def one_point_crossover(parent1, parent2, crossover_rate: float):
 # =========================
 # Mutasi
 # =========================
+def next_mutation_gap(log_q: float) -> int:
+    """
+    Jumlah gen yang dilewati sebelum mutasi berikutnya.
+    Gap ~ Geometric(p) dengan log_q = log(1 - p), sehingga peluang tiap gen
+    termutasi tetap p tanpa perlu random.random() untuk setiap gen.
+    """
+    # 1 - random.random() ada di (0, 1], jadi log-nya aman.
+    # Untuk p sangat kecil hasil bagi bisa inf, dipotong supaya int() tidak overflow
+    return int(min(math.log1p(-random.random()) / log_q, sys.maxsize))
+
+
 def mutate(individual, timeslots, ruang_list, matkul_list, mutation_rate: float):
     """Mutasi: dengan probabilitas tertentu, ubah timeslot/ruang 1 gen."""
     num_rooms = len(ruang_list)
+    L = len(individual)
+
+    if mutation_rate <= 0.0:
+        return individual
+
+    # Lompat langsung ke posisi gen yang termutasi (geometric skip sampling),
+    # biaya sebanding jumlah mutasi, bukan panjang kromosom
+    if mutation_rate >= 1.0:
+        positions = range(L)
+    else:
+        # log1p tetap akurat untuk rate kecil; 1.0 - rate bisa dibulatkan ke 1.0
+        log_q = math.log1p(-mutation_rate)
+        if log_q == 0.0:
+            return individual
+        positions = []
+        i = next_mutation_gap(log_q)
+        while i < L:
+            positions.append(i)
+            i += 1 + next_mutation_gap(log_q)
+
+    for i in positions:
+        ts_index, room_index = individual[i]
+        mk = matkul_list[i]
 
-    for i, gene in enumerate(individual):
-        if random.random() < mutation_rate:
-            ts_index, room_index = gene
-            mk = matkul_list[i]
-
-            allowed = [ts for ts in timeslots if ts["session"] in mk["allowed_sessions"]]
-            if mk["sks"] == 2:
-                allowed = [ts for ts in allowed if ts["type"] == 2]
-            else:
-                allowed = [ts for ts in allowed if ts["type"] == 3]
+        allowed = [ts for ts in timeslots if ts["session"] in mk["allowed_sessions"]]
+        if mk["sks"] == 2:
+            allowed = [ts for ts in allowed if ts["type"] == 2]
+        else:
+            allowed = [ts for ts in allowed if ts["type"] == 3]
 
-            if not allowed:
-                allowed = timeslots
+        if not allowed:
+            allowed = timeslots
 
-            ts = random.choice(allowed)
+        ts = random.choice(allowed)
 
-            # 50% chance ganti ruang, 100% ganti timeslot (di sini kita set ke timeslot baru)
-            if random.random() < 0.5:
-                room_index = random.randrange(num_rooms)
+        # 50% chance ganti ruang, 100% ganti timeslot (di sini kita set ke timeslot baru)
+        if random.random() < 0.5:
+            room_index = random.randrange(num_rooms)
 
-            individual[i] = (ts["index"], room_index)
+        individual[i] = (ts["index"], room_index)
 
     return individual
 
@@ -299,14 +370,26 @@ def export_to_csv(individual, timeslots, ruang_list, matkul_list, filename="jadw
 # =========================
 # Main Loop GA
 # =========================
-def run_ga():
-    timeslots, ruang_list, matkul_list = load_data()
+def run_ga(timeslots=None, ruang_list=None, matkul_list=None, lower_bound=None,
+           refine=None, refine_every=0, refine_top=0, output_file="jadwal_ga.csv"):
+    """
+    Jalankan GA. Data masalah (dan lower bound) dibaca dari dataset kalau tidak diberikan.
+    Jika `refine` diberikan, setiap `refine_every` generasi
+    `refine_top` individu terbaik diserahkan ke refine(list individu) yang
+    mengembalikan individu hasil perbaikan (mode memetic, lihat hybrid.py).
+    """
+    if timeslots is None:
+        timeslots, ruang_list, matkul_list = load_data()
 
     # mutation rate ditetapkan "berdasarkan struktur masalah" (panjang kromosom),
     # bukan coba-coba angka random
     L = len(matkul_list)
     mutation_rate = get_mutation_rate(L)
 
+    # Batas bawah penalty dari argumen counting; GA berhenti kalau sudah tercapai
+    if lower_bound is None:
+        lower_bound = compute_lower_bound(timeslots, ruang_list, matkul_list)
+
     print("=== PARAMETER GA ===")
     print(f"POPULATION_SIZE : {POPULATION_SIZE}")
     print(f"NUM_GENERATIONS : {NUM_GENERATIONS}")
@@ -315,6 +398,10 @@ def run_ga():
     print(f"ELITISM         : {ELITISM}")
     print(f"CHROMOSOME LEN  : {L}")
     print(f"MUTATION_RATE   : {mutation_rate:.4f}")
+    print(f"DIVERSITY MIN   : {DIVERSITY_THRESHOLD}")
+    print(f"LOWER BOUND     : {lower_bound}")
+    if refine is not None:
+        print(f"MEMETIC REFINE  : top-{refine_top} tiap {refine_every} generasi")
     print("====================\n")
 
     population = initialize_population(POPULATION_SIZE, timeslots, ruang_list, matkul_list)
@@ -323,6 +410,10 @@ def run_ga():
     best_fitness = -1.0
     best_penalty = None
 
+    # Mutation rate aktif, dinaikkan sementara saat populasi konvergen
+    current_mutation_rate = mutation_rate
+    low_diversity_gens = 0
+
     for gen in range(NUM_GENERATIONS):
         fitnesses = []
         penalties = []
@@ -332,6 +423,17 @@ def run_ga():
             fitnesses.append(fit)
             penalties.append(pen)
 
+        # Memetic: perbaiki individu elite dengan local search, lalu masukkan kembali
+        if refine is not None and refine_every > 0 and gen > 0 and gen % refine_every == 0:
+            elite_idx = sorted(range(len(population)), key=lambda i: penalties[i])[:refine_top]
+            refined = refine([population[i] for i in elite_idx])
+            for i, ind in zip(elite_idx, refined):
+                fit, pen = compute_fitness(ind, timeslots, ruang_list, matkul_list)
+                if pen <= penalties[i]:
+                    population[i] = ind
+                    fitnesses[i] = fit
+                    penalties[i] = pen
+
         # Update best global
         for i, fit in enumerate(fitnesses):
             if fit > best_fitness:
@@ -339,13 +441,39 @@ def run_ga():
                 best_individual = population[i][:]
                 best_penalty = penalties[i]
 
-        if gen % 10 == 0 or gen == NUM_GENERATIONS - 1:
+        diversity, entropy = population_diversity(population)
+
+        if gen % 10 == 0 or gen == NUM_GENERATIONS - 1 or best_penalty <= lower_bound:
             print(
                 f"Generasi {gen:3d} | "
                 f"Fitness terbaik: {best_fitness:.6f} | "
-                f"Penalty: {best_penalty}"
+                f"Penalty: {best_penalty} | "
+                f"Gap: {best_penalty - lower_bound} | "
+                f"Diversity: {diversity:.3f} | "
+                f"Entropy: {entropy:.3f}"
             )
 
+        if best_penalty <= lower_bound:
+            print(f"\n[OPTIMAL] Penalty mencapai lower bound ({lower_bound}) di generasi {gen}")
+            break
+
+        # Konvergen prematur: naikkan mutasi, kalau berlanjut restart sebagian populasi
+        if diversity < DIVERSITY_THRESHOLD:
+            low_diversity_gens += 1
+            current_mutation_rate = min(MAX_MUTATION_RATE, mutation_rate * MUTATION_BOOST)
+
+            if low_diversity_gens >= RESTART_PATIENCE:
+                ranked = sorted(range(len(population)), key=lambda i: penalties[i])
+                replaced = ranked[len(population) - int(len(population) * RESTART_FRACTION):]
+                for i in replaced:
+                    population[i] = create_random_individual(timeslots, ruang_list, matkul_list)
+                    fitnesses[i], penalties[i] = compute_fitness(population[i], timeslots, ruang_list, matkul_list)
+                low_diversity_gens = 0
+                print(f"Generasi {gen:3d} | [RESTART] {len(replaced)} individu diganti (diversity {diversity:.3f})")
+        else:
+            low_diversity_gens = 0
+            current_mutation_rate = mutation_rate
+
         # Buat generasi baru
         new_population = []
 
@@ -360,8 +488,8 @@ def run_ga():
 
             child1, child2 = one_point_crossover(parent1, parent2, CROSSOVER_RATE)
 
-            child1 = mutate(child1, timeslots, ruang_list, matkul_list, mutation_rate)
-            child2 = mutate(child2, timeslots, ruang_list, matkul_list, mutation_rate)
+            child1 = mutate(child1, timeslots, ruang_list, matkul_list, current_mutation_rate)
+            child2 = mutate(child2, timeslots, ruang_list, matkul_list, current_mutation_rate)
 
             new_population.append(child1)
             if len(new_population) < POPULATION_SIZE:
@@ -372,8 +500,12 @@ def run_ga():
     print("\n=== HASIL AKHIR ===")
     print(f"Fitness terbaik: {best_fitness:.6f}")
     print(f"Total penalty:   {best_penalty}")
+    print(f"Lower bound:     {lower_bound} (gap {best_penalty - lower_bound})")
+    archive.update_archive([(best_individual, best_penalty)], timeslots, ruang_list, matkul_list)
     print_schedule(best_individual, timeslots, ruang_list, matkul_list)
-    export_to_csv(best_individual, timeslots, ruang_list, matkul_list)
+    export_to_csv(best_individual, timeslots, ruang_list, matkul_list, output_file)
+
+    return best_individual, best_penalty
 
 
 if __name__ == "__main__":
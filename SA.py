@@ -7,6 +7,15 @@ import os
 from collections import defaultdict
 from typing import List, Dict, Tuple
 
+import archive
+from problem import (
+    attach_student_groups,
+    compile_timeslots,
+    compute_lower_bound,
+    count_clashes,
+    soft_penalty,
+)
+
 
 # Parameter SA 
 NUM_TRIALS = 10                   # Jumlah percobaan
@@ -14,11 +23,17 @@ INITIAL_TEMPERATURE = 1000.0      # Lebih tinggi = lebih eksplorasi
 FINAL_TEMPERATURE = 0.1           # Lebih rendah = lebih eksploitasi
 COOLING_RATE = 0.99               # Lebih lambat = lebih banyak iterasi
 ACCEPTANCE_THRESHOLD = 0.8        # Kriteria penerimaan
-TARGET_FITNESS = 0.0              # Target fitness (0 = penalty minimum)
+TARGET_PENALTY = 0                # Target penalty (0 = tanpa pelanggaran), dinaikkan ke lower bound jika 0 mustahil
 MAX_NO_IMPROVEMENT = 100          # Lebih sabar
 MAX_RETRY = 3                     # Batas mengulang iterasi
 MAX_ITERATIONS = 1000             # Lebih banyak iterasi
 
+# Tipe move neighborhood, bobotnya menyesuaikan tingkat keberhasilan
+MOVE_TYPES = ["reassign", "swap", "free_room", "kempe"]
+MOVE_ADAPT_PERIOD = 50            # Update bobot move setiap N iterasi
+MOVE_ADAPT_REACTION = 0.3         # 0 = bobot tetap, 1 = hanya pakai periode terakhir
+MOVE_MIN_WEIGHT = 0.05            # Supaya tidak ada move yang mati total
+
 # Hari
 DAY_ORDER = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]
 
@@ -34,16 +49,11 @@ def load_data():
     with open("dataset/matkul.json", "r", encoding="utf-8") as f:
         matkul_list = json.load(f)
 
-    timeslots = []
-    for i, s in enumerate(sesi_list):
-        timeslots.append({
-            "index": i,
-            "day": s["day"],
-            "session": s["session"],
-            "start": s["start"],
-            "end": s["end"],
-            "type": s["type"],  
-        })
+    with open("dataset/jadwalmentah.json", "r", encoding="utf-8") as f:
+        jadwal_mentah = json.load(f)
+
+    timeslots = compile_timeslots(sesi_list)
+    attach_student_groups(matkul_list, jadwal_mentah)
 
     return timeslots, ruang_list, matkul_list
 
@@ -52,9 +62,10 @@ def generate_initial_solution(timeslots, ruang_list, matkul_list) -> List[Tuple[
     """Generate solusi awal dengan greedy approach"""
     solution = []
     
-    # Track penggunaan ruang dan dosen per timeslot
+    # Track penggunaan ruang, dosen, dan kelompok mahasiswa per timeslot
     used_rooms = defaultdict(set)
     used_lecturers = defaultdict(set)
+    used_groups = defaultdict(set)
     
     for mk in matkul_list:
         best_penalty = float('inf')
@@ -72,21 +83,29 @@ def generate_initial_solution(timeslots, ruang_list, matkul_list) -> List[Tuple[
         
         # Coba beberapa kombinasi timeslot-ruangan
         for ts in allowed:
+            # Slot ini sendiri + slot lain yang waktunya overlap
+            clash_slots = (ts["index"],) + ts["overlaps"]
+            
             for room_idx in range(len(ruang_list)):
                 room = ruang_list[room_idx]
-                key = (ts["day"], ts["session"])
                 
                 # Hitung penalty untuk kombinasi ini
                 temp_penalty = 0
                 
-                # Cek konflik ruangan
-                if room in used_rooms[key]:
-                    temp_penalty += 10
-                
-                # Cek konflik dosen
-                for dosen in mk["dosen"]:
-                    if dosen in used_lecturers[key]:
-                        temp_penalty += 8
+                for key in clash_slots:
+                    # Cek konflik ruangan
+                    if room in used_rooms[key]:
+                        temp_penalty += 10
+                    
+                    # Cek konflik dosen
+                    for dosen in mk["dosen"]:
+                        if dosen in used_lecturers[key]:
+                            temp_penalty += 8
+                    
+                    # Cek konflik kelompok mahasiswa
+                    for group in mk["groups"]:
+                        if group in used_groups[key]:
+                            temp_penalty += 8
                 
                 # Pilih kombinasi dengan penalty terendah
                 if temp_penalty < best_penalty:
@@ -95,11 +114,12 @@ def generate_initial_solution(timeslots, ruang_list, matkul_list) -> List[Tuple[
         
         # Tambahkan ke solusi dan update tracking
         solution.append(best_gene)
-        ts = timeslots[best_gene[0]]
-        key = (ts["day"], ts["session"])
+        key = best_gene[0]
         used_rooms[key].add(ruang_list[best_gene[1]])
         for dosen in mk["dosen"]:
             used_lecturers[key].add(dosen)
+        for group in mk["groups"]:
+            used_groups[key].add(group)
     
     return solution
 
@@ -109,15 +129,15 @@ def calculate_penalty(solution, timeslots, ruang_list, matkul_list) -> int:
     """Hitung total penalty (semakin kecil semakin baik)."""
     penalty = 0
 
-    used_room: Dict[Tuple[str, int, str], List[int]] = defaultdict(list)
-    used_dosen: Dict[Tuple[str, int, str], List[int]] = defaultdict(list)
+    used_room: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    used_dosen: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    used_group: Dict[Tuple[int, str], List[int]] = defaultdict(list)
 
     for i, gene in enumerate(solution):
         ts_index, room_index = gene
         mk = matkul_list[i]
         ts = timeslots[ts_index]
 
-        day = ts["day"]
         session = ts["session"]
         room = ruang_list[room_index]
 
@@ -132,23 +152,24 @@ def calculate_penalty(solution, timeslots, ruang_list, matkul_list) -> int:
             penalty += 3
 
         # Simpan penggunaan ruangan
-        used_room[(day, session, room)].append(i)
+        used_room[(ts_index, room)].append(i)
 
         # Simpan penggunaan dosen
         for d in mk["dosen"]:
-            used_dosen[(day, session, d)].append(i)
+            used_dosen[(ts_index, d)].append(i)
+
+        # Simpan penggunaan kelompok mahasiswa
+        for g in mk["groups"]:
+            used_group[(ts_index, g)].append(i)
 
-    # Hard Const Konflik ruangan: >1 kelas di hari-sesi-ruang sama
-    for _, kelas_idx in used_room.items():
-        if len(kelas_idx) > 1:
-            conflict_count = len(kelas_idx) - 1
-            penalty += 10 * conflict_count
+    # Hard Const Konflik ruangan: >1 kelas di ruang sama pada slot yang sama/overlap
+    penalty += 10 * count_clashes(used_room, timeslots)
 
-    # Hard Const Konflik dosen: >1 kelas di hari-sesi sama untuk dosen sama
-    for _, kelas_idx in used_dosen.items():
-        if len(kelas_idx) > 1:
-            conflict_count = len(kelas_idx) - 1
-            penalty += 8 * conflict_count
+    # Hard Const Konflik dosen: >1 kelas dosen sama pada slot yang sama/overlap
+    penalty += 8 * count_clashes(used_dosen, timeslots)
+
+    # Hard Const: Konflik kelompok mahasiswa (prodi + semester + kelas yang sama)
+    penalty += 8 * count_clashes(used_group, timeslots)
 
     return penalty
 
@@ -160,86 +181,295 @@ def calculate_fitness(solution, timeslots, ruang_list, matkul_list) -> Tuple[flo
     return fitness, penalty
 
 
-# Generate neighbor
-def generate_neighbor(current_solution, timeslots, ruang_list, matkul_list) -> List[Tuple[int, int]]:
-    """Generate neighbor dengan strategi perbaikan konflik"""
-    neighbor = copy.deepcopy(current_solution)
-    
-    # Identifikasi kelas dengan konflik
-    conflicts = find_conflicts(neighbor, timeslots, ruang_list, matkul_list)
-    
-    if conflicts:
-        # Prioritas perbaiki yang berkonflik
-        num_changes = min(len(conflicts), random.randint(1, 3))
-        indices = random.sample(conflicts, num_changes)
-    else:
-        # Random change jika tidak ada konflik
-        num_changes = random.randint(1, 2)
-        indices = random.sample(range(len(neighbor)), num_changes)
-    
-    for i in indices:
-        mk = matkul_list[i]
-        
-        # Coba cari slot yang lebih baik
+# Struktur bantu untuk delta evaluation
+def build_allowed_slots(timeslots, matkul_list) -> List[List[int]]:
+    """Index timeslot yang sesuai allowed_sessions + tipe sks, per matkul"""
+    allowed_slots = []
+    for mk in matkul_list:
         allowed = [ts for ts in timeslots if ts["session"] in mk["allowed_sessions"]]
         if mk["sks"] == 2:
             allowed = [ts for ts in allowed if ts["type"] == 2]
         else:
             allowed = [ts for ts in allowed if ts["type"] == 3]
-        
+
         if not allowed:
             allowed = timeslots
-        
-        # Pilih timeslot yang meminimalkan konflik
-        best_penalty = float('inf')
-        best_gene = neighbor[i]
-        
-        for _ in range(min(5, len(allowed))):  # Coba 5 slot random
-            ts = random.choice(allowed)
-            room_idx = random.randrange(len(ruang_list))
-            
-            # Test penalty jika pakai kombinasi ini
-            temp_neighbor = copy.deepcopy(neighbor)
-            temp_neighbor[i] = (ts["index"], room_idx)
-            penalty = calculate_penalty(temp_neighbor, timeslots, ruang_list, matkul_list)
-            
-            if penalty < best_penalty:
-                best_penalty = penalty
-                best_gene = (ts["index"], room_idx)
-        
-        neighbor[i] = best_gene
-    
-    return neighbor
 
-def find_conflicts(solution, timeslots, ruang_list, matkul_list) -> List[int]:
-    """Identifikasi index kelas yang berkonflik"""
-    conflicts = set()
-    
-    used_room = defaultdict(list)
-    used_dosen = defaultdict(list)
-    
-    for i, gene in enumerate(solution):
-        ts_index, room_index = gene
+        allowed_slots.append([ts["index"] for ts in allowed])
+    return allowed_slots
+
+
+def build_lecturer_index(matkul_list) -> Dict[str, List[int]]:
+    """Adjacency graf konflik dosen: dosen -> index matkul yang diampu"""
+    kelas_dosen = defaultdict(list)
+    for i, mk in enumerate(matkul_list):
+        for d in mk["dosen"]:
+            kelas_dosen[d].append(i)
+    return kelas_dosen
+
+
+def build_index(timeslots, matkul_list):
+    """Struktur bantu yang hanya bergantung pada data masalah, dibangun sekali per run"""
+    same_type = defaultdict(list)
+    for i, mk in enumerate(matkul_list):
+        same_type[mk["sks"] == 2].append(i)
+
+    return {
+        "allowed_slots": build_allowed_slots(timeslots, matkul_list),
+        "lecturer": build_lecturer_index(matkul_list),
+        "same_type": same_type,
+    }
+
+
+def build_usage(solution, timeslots, ruang_list, matkul_list):
+    """
+    Pemakaian ruang, dosen, kelompok mahasiswa, dan slot oleh solusi (dipakai untuk delta penalty).
+    Juga menyimpan jumlah pasangan bentrok per kelas, sehingga daftar kelas yang
+    konflik (usage["conflicts"]) selalu terbaru tanpa scan ulang seluruh jadwal.
+    """
+    usage = {
+        "room": {},
+        "dosen": {},
+        "group": {},
+        "slot": {},
+        "conflict_count": [0] * len(solution),
+        "conflicts": [],
+        "conflict_pos": {},
+    }
+
+    for i, (ts_index, room_index) in enumerate(solution):
+        _place(usage, i, ts_index, room_index, timeslots, ruang_list, matkul_list)
+
+    return usage
+
+
+def _resources(i, room_index, ruang_list, matkul_list):
+    """(tabel, resource) yang dipakai kelas i"""
+    yield "room", ruang_list[room_index]
+    for d in matkul_list[i]["dosen"]:
+        yield "dosen", d
+    for g in matkul_list[i]["groups"]:
+        yield "group", g
+
+
+def _add_conflicts(usage, i, n):
+    """Tambah n pasangan bentrok ke kelas i, perbarui daftar kelas konflik"""
+    if n == 0:
+        return
+    counts = usage["conflict_count"]
+    before = counts[i]
+    counts[i] += n
+
+    conflicts = usage["conflicts"]
+    pos = usage["conflict_pos"]
+    if before == 0:
+        pos[i] = len(conflicts)
+        conflicts.append(i)
+    elif counts[i] == 0:
+        # Hapus O(1): tukar dengan elemen terakhir
+        k = pos.pop(i)
+        last = conflicts.pop()
+        if last != i:
+            conflicts[k] = last
+            pos[last] = k
+
+
+def _partners(used, i, ts_index, resource, timeslots):
+    """Kelas lain yang bentrok dengan kelas i di (ts_index, resource), termasuk slot yang overlap"""
+    partners = [j for j in used.get((ts_index, resource), ()) if j != i]
+    for other in timeslots[ts_index]["overlaps"]:
+        partners.extend(used.get((other, resource), ()))
+    return partners
+
+
+def _place(usage, i, ts_index, room_index, timeslots, ruang_list, matkul_list):
+    for table, resource in _resources(i, room_index, ruang_list, matkul_list):
+        used = usage[table]
+        partners = _partners(used, i, ts_index, resource, timeslots)
+        for j in partners:
+            _add_conflicts(usage, j, 1)
+        _add_conflicts(usage, i, len(partners))
+        used.setdefault((ts_index, resource), set()).add(i)
+    usage["slot"].setdefault(ts_index, set()).add(i)
+
+
+def _remove(usage, i, ts_index, room_index, timeslots, ruang_list, matkul_list):
+    for table, resource in _resources(i, room_index, ruang_list, matkul_list):
+        used = usage[table]
+        key = (ts_index, resource)
+        used[key].discard(i)
+        if not used[key]:
+            # Jangan biarkan key kosong menumpuk
+            del used[key]
+        partners = _partners(used, i, ts_index, resource, timeslots)
+        for j in partners:
+            _add_conflicts(usage, j, -1)
+        _add_conflicts(usage, i, -len(partners))
+    usage["slot"][ts_index].discard(i)
+
+
+def move_delta(solution, changes, usage, timeslots, ruang_list, matkul_list) -> int:
+    """
+    Selisih penalty jika gen-gen di `changes` ({index: gen baru}) diterapkan.
+    Hanya menyentuh key ruang/dosen milik kelas yang berubah
+    (plus slot yang overlap dengannya).
+    """
+    delta = 0
+    counts = {}
+
+    def count(table, key):
+        if (table, key) not in counts:
+            counts[(table, key)] = len(usage[table].get(key, ()))
+        return counts[(table, key)]
+
+    def clashes(table, ts_index, resource):
+        # Bentrok yang ditimbulkan 1 kelas tambahan di (ts_index, resource)
+        n = 1 if count(table, (ts_index, resource)) >= 1 else 0
+        for other in timeslots[ts_index]["overlaps"]:
+            n += count(table, (other, resource))
+        return n
+
+    # Lepas dulu semua gen lama, baru pasang gen baru
+    for i in changes:
         mk = matkul_list[i]
-        ts = timeslots[ts_index]
-        
-        key = (ts["day"], ts["session"], ruang_list[room_index])
-        used_room[key].append(i)
-        
+        ts_index, room_index = solution[i]
+        delta -= soft_penalty(mk, timeslots[ts_index])
+
+        key = (ts_index, ruang_list[room_index])
+        counts[("room", key)] = count("room", key) - 1
+        delta -= 10 * clashes("room", *key)
+
         for d in mk["dosen"]:
-            key_dosen = (ts["day"], ts["session"], d)
-            used_dosen[key_dosen].append(i)
-    
-    # Tambahkan semua kelas yang berkonflik
-    for kelas_list in used_room.values():
-        if len(kelas_list) > 1:
-            conflicts.update(kelas_list)
-    
-    for kelas_list in used_dosen.values():
-        if len(kelas_list) > 1:
-            conflicts.update(kelas_list)
-    
-    return list(conflicts)
+            key = (ts_index, d)
+            counts[("dosen", key)] = count("dosen", key) - 1
+            delta -= 8 * clashes("dosen", *key)
+
+        for g in mk["groups"]:
+            key = (ts_index, g)
+            counts[("group", key)] = count("group", key) - 1
+            delta -= 8 * clashes("group", *key)
+
+    for i, (ts_index, room_index) in changes.items():
+        mk = matkul_list[i]
+        delta += soft_penalty(mk, timeslots[ts_index])
+
+        key = (ts_index, ruang_list[room_index])
+        delta += 10 * clashes("room", *key)
+        counts[("room", key)] = count("room", key) + 1
+
+        for d in mk["dosen"]:
+            key = (ts_index, d)
+            delta += 8 * clashes("dosen", *key)
+            counts[("dosen", key)] = count("dosen", key) + 1
+
+        for g in mk["groups"]:
+            key = (ts_index, g)
+            delta += 8 * clashes("group", *key)
+            counts[("group", key)] = count("group", key) + 1
+
+    return delta
+
+
+def apply_move(solution, changes, usage, timeslots, ruang_list, matkul_list):
+    """Terapkan changes ke solusi (in-place) dan perbarui usage"""
+    for i in changes:
+        _remove(usage, i, *solution[i], timeslots, ruang_list, matkul_list)
+
+    for i, (ts_index, room_index) in changes.items():
+        _place(usage, i, ts_index, room_index, timeslots, ruang_list, matkul_list)
+        solution[i] = (ts_index, room_index)
+
+
+# Generate neighbor
+def generate_neighbor(move_type, current_solution, usage, index,
+                      timeslots, ruang_list, matkul_list) -> Dict[int, Tuple[int, int]]:
+    """
+    Buat move bertipe `move_type`. Return {index kelas: gen baru},
+    kosong kalau move tidak bisa dibentuk dari solusi saat ini.
+    """
+    conflicts = usage["conflicts"]
+    allowed_slots = index["allowed_slots"]
+    # Prioritas perbaiki yang berkonflik
+    if conflicts:
+        i = random.choice(conflicts)
+    else:
+        i = random.randrange(len(current_solution))
+    ts_index, room_index = current_solution[i]
+
+    if move_type == "reassign":
+        # Re-draw (timeslot, ruang) untuk 1-3 kelas, pilih yang delta-nya terkecil
+        if conflicts:
+            indices = random.sample(conflicts, min(len(conflicts), random.randint(1, 3)))
+        else:
+            indices = random.sample(range(len(current_solution)), random.randint(1, 2))
+
+        changes = {}
+        for j in indices:
+            best_delta = float('inf')
+            best_gene = current_solution[j]
+            for _ in range(min(5, len(allowed_slots[j]))):  # Coba 5 slot random
+                gene = (random.choice(allowed_slots[j]), random.randrange(len(ruang_list)))
+                trial = dict(changes)
+                trial[j] = gene
+                delta = move_delta(current_solution, trial, usage, timeslots, ruang_list, matkul_list)
+                if delta < best_delta:
+                    best_delta = delta
+                    best_gene = gene
+            changes[j] = best_gene
+        return changes
+
+    if move_type == "swap":
+        # Tukar timeslot atau ruang dua kelas dengan tipe sks yang sama
+        same_type = index["same_type"][matkul_list[i]["sks"] == 2]
+        if len(same_type) < 2:
+            return {}
+        j = i
+        while j == i:
+            j = random.choice(same_type)
+        other_ts, other_room = current_solution[j]
+        if random.random() < 0.5:
+            return {i: (other_ts, room_index), j: (ts_index, other_room)}
+        return {i: (ts_index, other_room), j: (other_ts, room_index)}
+
+    if move_type == "free_room":
+        # Pindah ke ruang yang kosong di slot yang sama
+        clash_slots = (ts_index, *timeslots[ts_index]["overlaps"])
+        free_rooms = [
+            r for r in range(len(ruang_list))
+            if not any(usage["room"].get((t, ruang_list[r])) for t in clash_slots)
+        ]
+        if not free_rooms:
+            return {}
+        return {i: (ts_index, random.choice(free_rooms))}
+
+    if move_type == "kempe":
+        # Kempe chain di graf konflik dosen + kelompok mahasiswa antara dua slot bertipe sama
+        candidates = [t for t in allowed_slots[i] if t != ts_index]
+        if not candidates:
+            return {}
+        other = {ts_index: random.choice(candidates)}
+        other[other[ts_index]] = ts_index
+
+        chain = {i}
+        stack = [i]
+        while stack:
+            k = stack.pop()
+            target = other[current_solution[k][0]]
+            in_target = usage["slot"].get(target, ())
+            for d in matkul_list[k]["dosen"]:
+                for j in index["lecturer"][d]:
+                    if j not in chain and j in in_target:
+                        chain.add(j)
+                        stack.append(j)
+            for g in matkul_list[k]["groups"]:
+                for j in in_target:
+                    if j not in chain and g in matkul_list[j]["groups"]:
+                        chain.add(j)
+                        stack.append(j)
+
+        return {k: (other[current_solution[k][0]], current_solution[k][1]) for k in chain}
+
+    raise ValueError(f"Tipe move tidak dikenal: {move_type}")
 
 def acceptance_probability(current_penalty, neighbor_penalty, temperature) -> float:
     """
@@ -256,53 +486,77 @@ def acceptance_probability(current_penalty, neighbor_penalty, temperature) -> fl
     return math.exp(-delta / temperature)
 
 # Main func
-def simulated_annealing(timeslots, ruang_list, matkul_list):
+def simulated_annealing(timeslots, ruang_list, matkul_list, lower_bound=0, initial_solution=None,
+                        max_iterations=MAX_ITERATIONS, initial_temperature=INITIAL_TEMPERATURE,
+                        local_search_iter=50, index=None):
+    
+    # Berhenti begitu penalty terbaik mencapai batas bawah yang terbukti
+    target_penalty = max(TARGET_PENALTY, lower_bound)
     
     print("\n=== MEMULAI SIMULATED ANNEALING ===")
     print(f"Parameter:")
-    print(f"  - Initial Temperature: {INITIAL_TEMPERATURE}")
+    print(f"  - Initial Temperature: {initial_temperature}")
     print(f"  - Final Temperature: {FINAL_TEMPERATURE}")
     print(f"  - Cooling Rate: {COOLING_RATE}")
-    print(f"  - Max Iterations: {MAX_ITERATIONS}")
+    print(f"  - Max Iterations: {max_iterations}")
     print(f"  - Early Stop: {MAX_NO_IMPROVEMENT} iterasi tanpa perbaikan")
+    print(f"  - Lower Bound Penalty: {lower_bound}")
     print("=" * 50)
     
-    current_solution = generate_initial_solution(timeslots, ruang_list, matkul_list)
+    if initial_solution is None:
+        current_solution = generate_initial_solution(timeslots, ruang_list, matkul_list)
+    else:
+        current_solution = list(initial_solution)
     current_fitness, current_penalty = calculate_fitness(current_solution, timeslots, ruang_list, matkul_list)
     
-    best_solution = copy.deepcopy(current_solution)
+    best_solution = current_solution[:]
     best_fitness = current_fitness
     best_penalty = current_penalty
     
-    temperature = INITIAL_TEMPERATURE
+    if index is None:
+        index = build_index(timeslots, matkul_list)
+    usage = build_usage(current_solution, timeslots, ruang_list, matkul_list)
+    
+    # Statistik move untuk adaptasi bobot
+    move_weights = {m: 1.0 for m in MOVE_TYPES}
+    move_tried = {m: 0 for m in MOVE_TYPES}
+    move_score = {m: 0.0 for m in MOVE_TYPES}
+    move_accepted_total = {m: 0 for m in MOVE_TYPES}
+    
+    temperature = initial_temperature
     
     iteration = 0
     no_improvement_count = 0
     
-    print(f"\nSolusi awal: Fitness = {current_fitness:.5f}, Penalty = {current_penalty}")
+    print(f"\nSolusi awal: Fitness = {current_fitness:.5f}, Penalty = {current_penalty}, Gap = {current_penalty - lower_bound}")
     
-    while temperature > FINAL_TEMPERATURE and iteration < MAX_ITERATIONS:
-        if best_penalty == 0:
-            print(f"\n[SUCCESS] Solusi OPTIMAL (penalty=0) ditemukan di iterasi {iteration}!")
+    while temperature > FINAL_TEMPERATURE and iteration < max_iterations:
+        if best_penalty <= target_penalty:
+            print(f"\n[SUCCESS] Solusi OPTIMAL (penalty={best_penalty}, lower bound={lower_bound}) ditemukan di iterasi {iteration}!")
             break
         
-        neighbor_solution = generate_neighbor(current_solution, timeslots, ruang_list, matkul_list)
-        neighbor_fitness, neighbor_penalty = calculate_fitness(neighbor_solution, timeslots, ruang_list, matkul_list)
+        move_type = random.choices(MOVE_TYPES, weights=[move_weights[m] for m in MOVE_TYPES])[0]
+        changes = generate_neighbor(move_type, current_solution, usage, index, timeslots, ruang_list, matkul_list)
+        delta = move_delta(current_solution, changes, usage, timeslots, ruang_list, matkul_list)
+        neighbor_penalty = current_penalty + delta
+        move_tried[move_type] += 1
         
         accept_prob = acceptance_probability(current_penalty, neighbor_penalty, temperature)
         
-        if random.random() < accept_prob:
-            current_solution = neighbor_solution
+        if changes and random.random() < accept_prob:
+            apply_move(current_solution, changes, usage, timeslots, ruang_list, matkul_list)
             current_penalty = neighbor_penalty
-            current_fitness = neighbor_fitness
+            current_fitness = 1.0 / (1.0 + current_penalty)
+            move_accepted_total[move_type] += 1
+            move_score[move_type] += 1.0 if delta < 0 else 0.3
             
             if current_penalty < best_penalty:
-                best_solution = copy.deepcopy(current_solution)
+                best_solution = current_solution[:]
                 best_penalty = current_penalty
                 best_fitness = current_fitness
                 no_improvement_count = 0
                 
-                print(f"Iterasi {iteration:4d} | NEW BEST | Fitness: {best_fitness:.5f} | Penalty: {best_penalty} | Temp: {temperature:.2f}")
+                print(f"Iterasi {iteration:4d} | NEW BEST | Fitness: {best_fitness:.5f} | Penalty: {best_penalty} | Gap: {best_penalty - lower_bound} | Temp: {temperature:.2f}")
             else:
                 no_improvement_count += 1
         else:
@@ -311,8 +565,20 @@ def simulated_annealing(timeslots, ruang_list, matkul_list):
         temperature *= COOLING_RATE
         iteration += 1
         
+        # Adaptasi bobot move berdasarkan keberhasilan periode terakhir
+        if iteration % MOVE_ADAPT_PERIOD == 0:
+            for m in MOVE_TYPES:
+                if move_tried[m]:
+                    rate = move_score[m] / move_tried[m]
+                    move_weights[m] = max(
+                        MOVE_MIN_WEIGHT,
+                        (1 - MOVE_ADAPT_REACTION) * move_weights[m] + MOVE_ADAPT_REACTION * rate,
+                    )
+                move_tried[m] = 0
+                move_score[m] = 0.0
+        
         if iteration % 100 == 0:
-            print(f"Iterasi {iteration:4d} | Fitness: {best_fitness:.5f} | Penalty: {best_penalty} | Temp: {temperature:.2f}")
+            print(f"Iterasi {iteration:4d} | Fitness: {best_fitness:.5f} | Penalty: {best_penalty} | Gap: {best_penalty - lower_bound} | Temp: {temperature:.2f}")
         
         if no_improvement_count >= MAX_NO_IMPROVEMENT:
             print(f"\n[EARLY STOP] Tidak ada perbaikan setelah {MAX_NO_IMPROVEMENT} iterasi")
@@ -324,45 +590,38 @@ def simulated_annealing(timeslots, ruang_list, matkul_list):
     print(f"Total Iterasi: {iteration}")
     print(f"Fitness Terbaik: {best_fitness:.6f}")
     print(f"Penalty Terbaik: {best_penalty}")
+    print("Move diterima: " + ", ".join(f"{m}={move_accepted_total[m]}" for m in MOVE_TYPES))
     
-    # Sebelum return, jalankan local search
-    print("\nMenjalankan Local Search untuk perbaikan akhir...")
-    best_solution = local_search(best_solution, timeslots, ruang_list, matkul_list)
-    best_fitness, best_penalty = calculate_fitness(best_solution, timeslots, ruang_list, matkul_list)
+    # Sebelum return, jalankan local search (tidak perlu kalau sudah di lower bound)
+    if best_penalty > target_penalty and local_search_iter > 0:
+        print("\nMenjalankan Local Search untuk perbaikan akhir...")
+        best_solution = local_search(best_solution, timeslots, ruang_list, matkul_list, local_search_iter, index)
+        best_fitness, best_penalty = calculate_fitness(best_solution, timeslots, ruang_list, matkul_list)
     
     return best_solution, best_penalty, best_fitness
 
-def local_search(solution, timeslots, ruang_list, matkul_list, max_iter=50):
+def local_search(solution, timeslots, ruang_list, matkul_list, max_iter=50, index=None):
     """Perbaiki solusi dengan hill climbing lokal"""
     current = copy.deepcopy(solution)
-    current_penalty = calculate_penalty(current, timeslots, ruang_list, matkul_list)
+    usage = build_usage(current, timeslots, ruang_list, matkul_list)
+    if index is None:
+        index = build_index(timeslots, matkul_list)
     
     for _ in range(max_iter):
         improved = False
-        conflicts = find_conflicts(current, timeslots, ruang_list, matkul_list)
         
-        if not conflicts:
+        if not usage["conflicts"]:
             break
         
-        for i in conflicts:
-            mk = matkul_list[i]
-            allowed = [ts for ts in timeslots if ts["session"] in mk["allowed_sessions"]]
-            
-            if mk["sks"] == 2:
-                allowed = [ts for ts in allowed if ts["type"] == 2]
-            else:
-                allowed = [ts for ts in allowed if ts["type"] == 3]
-            
-            for ts in allowed:
+        # Salinan: apply_move mengubah daftar konflik
+        for i in list(usage["conflicts"]):
+            for ts_index in index["allowed_slots"][i]:
                 for room_idx in range(len(ruang_list)):
-                    neighbor = copy.deepcopy(current)
-                    neighbor[i] = (ts["index"], room_idx)
-                    
-                    new_penalty = calculate_penalty(neighbor, timeslots, ruang_list, matkul_list)
+                    changes = {i: (ts_index, room_idx)}
                     
-                    if new_penalty < current_penalty:
-                        current = neighbor
-                        current_penalty = new_penalty
+                    # Delta penalty, tanpa hitung ulang seluruh jadwal
+                    if move_delta(current, changes, usage, timeslots, ruang_list, matkul_list) < 0:
+                        apply_move(current, changes, usage, timeslots, ruang_list, matkul_list)
                         improved = True
                         break
                 
@@ -459,6 +718,17 @@ def export_to_csv(solution, timeslots, ruang_list, matkul_list, filename="jadwal
 def main():
     # Load data terlebih dahulu
     timeslots, ruang_list, matkul_list = load_data()
+    lower_bound = compute_lower_bound(timeslots, ruang_list, matkul_list)
+    print(f"Lower bound penalty: {lower_bound}")
+    
+    # Percobaan awal dimulai dari arsip elite, sisanya dari greedy
+    seeds = archive.load_seeds(
+        timeslots,
+        ruang_list,
+        matkul_list,
+        NUM_TRIALS,
+        lambda: generate_initial_solution(timeslots, ruang_list, matkul_list),
+    )
     
     all_results = []
     
@@ -468,7 +738,8 @@ def main():
         print(f"{'='*50}")
         
         best_solution, best_penalty, best_fitness = simulated_annealing(
-            timeslots, ruang_list, matkul_list
+            timeslots, ruang_list, matkul_list, lower_bound,
+            seeds[trial] if trial < len(seeds) else None
         )
         
         all_results.append({
@@ -477,12 +748,17 @@ def main():
             'penalty': best_penalty,
             'fitness': best_fitness
         })
+        
+        # Lower bound tercapai = terbukti optimal, percobaan lain tidak perlu
+        if best_penalty <= lower_bound:
+            print(f"\n[OPTIMAL] Penalty {best_penalty} = lower bound, percobaan dihentikan")
+            break
     
     # Pilih hasil terbaik dari semua percobaan
     best_result = min(all_results, key=lambda x: x['penalty'])
     
     print(f"\n{'='*80}")
-    print(f"RINGKASAN {NUM_TRIALS} PERCOBAAN")
+    print(f"RINGKASAN {len(all_results)} PERCOBAAN")
     print(f"{'='*80}")
     for r in all_results:
         print(f"Percobaan {r['trial']}: Penalty = {r['penalty']}, Fitness = {r['fitness']:.6f}")
@@ -490,6 +766,11 @@ def main():
     print(f"\nHASIL TERBAIK: Percobaan {best_result['trial']}")
     print(f"   Penalty: {best_result['penalty']}")
     print(f"   Fitness: {best_result['fitness']:.6f}")
+    print(f"   Gap ke lower bound: {best_result['penalty'] - lower_bound}")
+    
+    archive.update_archive(
+        [(r['solution'], r['penalty']) for r in all_results], timeslots, ruang_list, matkul_list
+    )
     
     # Print & export hasil terbaik
     print_schedule(best_result['solution'], timeslots, ruang_list, matkul_list)
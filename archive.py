@@ -0,0 +1,219 @@
+import csv
+import glob
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Arsip solusi elite lintas run, satu file per hash data masalah
+ARCHIVE_DIR = "archive"
+ARCHIVE_SIZE = 10          # Jumlah entri maksimum per masalah
+MIN_DISTANCE = 0.05        # Fraksi gen berbeda minimum agar dianggap solusi lain
+
+# Hasil export lama yang dipakai sebagai bibit kalau arsip masih kosong
+LEGACY_CSV_FILES = ["jadwal_sa.csv", "jadwal_ga.csv"]
+
+
+# =========================
+# Hash & encoding
+# =========================
+def problem_hash(timeslots, ruang_list, matkul_list) -> str:
+    """Hash data masalah (slot, ruang, matkul). Berubah jika dataset berubah."""
+    data = {
+        "timeslots": [
+            [ts["day"], ts["session"], ts["start"], ts["end"], ts["type"]] for ts in timeslots
+        ],
+        "ruang": ruang_list,
+        "matkul": matkul_list,
+    }
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def archive_path(key: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"{key}.json")
+
+
+def encode_solution(solution, timeslots, ruang_list, matkul_list) -> Dict[str, list]:
+    """
+    Simpan gen per id matkul sebagai [day, session, room, kode_mk, kelas] agar bisa di-remap.
+    (kode_mk, kelas) dipakai kalau skema id berubah.
+    """
+    schedule = {}
+    for i, (ts_index, room_index) in enumerate(solution):
+        ts = timeslots[ts_index]
+        mk = matkul_list[i]
+        schedule[mk["id"]] = [ts["day"], ts["session"], ruang_list[room_index], mk["kode_mk"], mk["kelas"]]
+    return schedule
+
+
+def decode_solution(schedule, timeslots, ruang_list, matkul_list) -> Tuple[List[Optional[Tuple[int, int]]], int]:
+    """
+    Ubah schedule arsip ke kromosom untuk dataset saat ini.
+    Matkul dicari lewat id, lalu lewat (kode_mk, kelas) untuk gen yang id-nya
+    tidak dikenal lagi (dipasangkan sesuai urutan, seperti import_legacy_csv).
+    Gen matkul/slot/ruang yang tidak dikenal lagi bernilai None.
+    Return (solusi, jumlah gen yang berhasil di-remap).
+    """
+    slot_index = {(ts["day"], ts["session"]): ts["index"] for ts in timeslots}
+    room_index = {}
+    for r, room in enumerate(ruang_list):
+        room_index.setdefault(room, r)
+
+    ids = {mk["id"] for mk in matkul_list}
+    kelas_index = defaultdict(list)
+    for mk_id, gene in schedule.items():
+        # Entri lama hanya [day, session, room], tidak bisa dicari lewat kelas
+        if mk_id not in ids and len(gene) >= 5:
+            kelas_index[(gene[3], gene[4])].append(gene)
+
+    solution = [None] * len(matkul_list)
+    mapped = 0
+    for i, mk in enumerate(matkul_list):
+        gene = schedule.get(mk["id"])
+        if gene is None:
+            genes = kelas_index.get((mk["kode_mk"], mk["kelas"]))
+            if not genes:
+                continue
+            gene = genes.pop(0)
+        day, session, room = gene[:3]
+        if (day, session) in slot_index and room in room_index:
+            solution[i] = (slot_index[(day, session)], room_index[room])
+            mapped += 1
+
+    return solution, mapped
+
+
+def distance(a, b) -> float:
+    """Fraksi gen yang berbeda (Hamming distance ternormalisasi)."""
+    if not a:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x != y) / len(a)
+
+
+# =========================
+# Baca / tulis arsip
+# =========================
+def read_entries(path: str) -> List[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["entries"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def import_legacy_csv(filename, timeslots, ruang_list, matkul_list) -> Optional[Dict[str, list]]:
+    """Baca jadwal hasil export_to_csv lama menjadi schedule {id: [day, session, room]}."""
+    filepath = os.path.join(os.path.dirname(__file__), filename)
+    if not os.path.exists(filepath):
+        return None
+
+    # (kode_mk, kelas) bisa muncul lebih dari sekali, dipasangkan sesuai urutan
+    kelas_index = defaultdict(list)
+    for mk in matkul_list:
+        kelas_index[(mk["kode_mk"], mk["kelas"])].append(mk["id"])
+
+    schedule = {}
+    with open(filepath, "r", newline="", encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            try:
+                ids = kelas_index.get((row["kode_mk"], row["kelas"]))
+                if ids:
+                    schedule[ids.pop(0)] = [row["day"], int(row["session"]), row["room"]]
+            except (KeyError, ValueError):
+                return None
+
+    return schedule or None
+
+
+def load_seeds(timeslots, ruang_list, matkul_list, max_count: int,
+               make_fallback: Callable[[], List[Tuple[int, int]]]) -> List[List[Tuple[int, int]]]:
+    """
+    Ambil hingga `max_count` solusi awal dari arsip.
+    Prioritas: entri untuk hash dataset ini, lalu entri arsip dataset lain
+    (di-remap lewat id matkul atau (kode_mk, kelas)), lalu CSV hasil run lama.
+    Tingkat berikutnya dicoba kalau belum ada schedule yang ter-remap.
+    """
+    if max_count <= 0:
+        return []
+
+    seeds = []
+
+    def add_seeds(schedules):
+        # Hanya schedule yang benar-benar ter-remap yang dihitung
+        for schedule in schedules:
+            if len(seeds) >= max_count:
+                return
+            solution, mapped = decode_solution(schedule, timeslots, ruang_list, matkul_list)
+            if not mapped:
+                continue
+            if mapped < len(solution):
+                # Fallback (mis. greedy SA) mahal, hanya dibangun kalau ada gen yang tidak ter-remap
+                fallback = make_fallback()
+                solution = [gene if gene is not None else fallback[i] for i, gene in enumerate(solution)]
+            seeds.append(solution)
+
+    key = problem_hash(timeslots, ruang_list, matkul_list)
+    add_seeds(e["schedule"] for e in sorted(read_entries(archive_path(key)), key=lambda e: e["penalty"]))
+
+    if not seeds:
+        # Dataset berubah: pakai arsip dataset lain, terbaru dulu
+        others = [p for p in glob.glob(os.path.join(ARCHIVE_DIR, "*.json")) if p != archive_path(key)]
+        others.sort(key=os.path.getmtime, reverse=True)
+        for path in others:
+            add_seeds(e["schedule"] for e in sorted(read_entries(path), key=lambda e: e["penalty"]))
+            if len(seeds) >= max_count:
+                break
+
+    if not seeds:
+        for filename in LEGACY_CSV_FILES:
+            schedule = import_legacy_csv(filename, timeslots, ruang_list, matkul_list)
+            if schedule:
+                add_seeds([schedule])
+
+    if seeds:
+        print(f"[ARSIP] {len(seeds)} solusi awal diambil dari arsip elite")
+    return seeds
+
+
+def update_archive(results, timeslots, ruang_list, matkul_list) -> None:
+    """
+    Masukkan hasil run [(solusi, penalty), ...] ke arsip.
+    Solusi yang terlalu mirip entri lain hanya disimpan yang lebih baik,
+    lalu arsip dipangkas ke ARCHIVE_SIZE entri terbaik.
+    """
+    key = problem_hash(timeslots, ruang_list, matkul_list)
+    path = archive_path(key)
+
+    entries = []
+    for e in read_entries(path):
+        solution, mapped = decode_solution(e["schedule"], timeslots, ruang_list, matkul_list)
+        if mapped == len(matkul_list):
+            entries.append((solution, e["penalty"]))
+
+    for solution, penalty in results:
+        similar = [k for k, (other, _) in enumerate(entries) if distance(solution, other) < MIN_DISTANCE]
+        if any(entries[k][1] <= penalty for k in similar):
+            continue
+        entries = [entry for k, entry in enumerate(entries) if k not in similar]
+        entries.append((list(solution), penalty))
+
+    entries.sort(key=lambda e: e[1])
+    entries = entries[:ARCHIVE_SIZE]
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "problem_hash": key,
+                "entries": [
+                    {"penalty": penalty, "schedule": encode_solution(solution, timeslots, ruang_list, matkul_list)}
+                    for solution, penalty in entries
+                ],
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+    print(f"[ARSIP] Arsip elite diperbarui: {len(entries)} entri ({path})")
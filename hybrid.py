@@ -0,0 +1,87 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import GA
+import SA
+from problem import compute_lower_bound
+from shared_problem import SharedPopulation, SharedProblem
+
+# Parameter mode memetic (GA + SA/local search)
+REFINE_EVERY = 10                 # Refinement setiap K generasi
+REFINE_TOP = 4                    # Jumlah individu elite (E) yang diperbaiki
+REFINE_WORKERS = os.cpu_count() or 1
+REFINE_SA_ITERATIONS = 200        # Budget iterasi SA per individu
+REFINE_TEMPERATURE = 10.0         # Suhu awal rendah: refinement, bukan eksplorasi
+REFINE_LOCAL_SEARCH_ITER = 20     # Budget hill climbing setelah SA (0 = tanpa local search)
+
+# Data masalah per worker, di-attach sekali oleh initializer pool
+_worker_problem = None
+_worker_data = None
+_worker_population = None
+
+
+def _init_worker(problem_name, layout, population_name, rows, length, lower_bound):
+    global _worker_problem, _worker_data, _worker_population
+    # Blok tetap ter-attach selama worker hidup: SA membaca array shared memory
+    # lewat view, tanpa salinan data masalah per worker
+    _worker_problem = SharedProblem.attach(problem_name, layout)
+    _worker_data = _worker_problem.solver_views() + (lower_bound,)
+    _worker_population = SharedPopulation.attach(population_name, rows, length)
+
+
+def refine_individual(row):
+    """SA singkat dari individu GA di baris `row` buffer populasi (dijalankan di proses worker)."""
+    timeslots, ruang_list, matkul_list, index, lower_bound = _worker_data
+
+    # Output SA per iterasi tidak berguna di worker
+    with contextlib.redirect_stdout(io.StringIO()):
+        solution, _, _ = SA.simulated_annealing(
+            timeslots,
+            ruang_list,
+            matkul_list,
+            lower_bound,
+            initial_solution=_worker_population.read(row),
+            max_iterations=REFINE_SA_ITERATIONS,
+            initial_temperature=REFINE_TEMPERATURE,
+            local_search_iter=REFINE_LOCAL_SEARCH_ITER,
+            index=index,
+        )
+    _worker_population.write(row, solution)
+
+
+def run_hybrid():
+    timeslots, ruang_list, matkul_list = GA.load_data()
+    lower_bound = compute_lower_bound(timeslots, ruang_list, matkul_list)
+
+    # Data masalah & individu elite dibagi lewat shared memory, bukan pickle per task
+    with SharedProblem.create(timeslots, ruang_list, matkul_list) as problem, \
+            SharedPopulation.create(REFINE_TOP, len(matkul_list)) as population, \
+            ProcessPoolExecutor(
+                max_workers=REFINE_WORKERS,
+                initializer=_init_worker,
+                initargs=(problem.name, problem.layout, population.name, REFINE_TOP, len(matkul_list), lower_bound),
+            ) as pool:
+
+        def refine(individuals):
+            for row, ind in enumerate(individuals):
+                population.write(row, ind)
+            list(pool.map(refine_individual, range(len(individuals))))
+            return [population.read(row) for row in range(len(individuals))]
+
+        # Pool dan GA memakai model yang sama persis
+        return GA.run_ga(
+            timeslots,
+            ruang_list,
+            matkul_list,
+            lower_bound,
+            refine=refine,
+            refine_every=REFINE_EVERY,
+            refine_top=REFINE_TOP,
+            output_file="jadwal_hybrid.csv",
+        )
+
+
+if __name__ == "__main__":
+    run_hybrid()
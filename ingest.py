@@ -0,0 +1,296 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+from problem import student_groups
+
+# Path default
+RAW_FILE = "dataset/jadwalmentah.json"
+SESI_FILE = "dataset/sesi.json"
+OUTPUT_FILE = "dataset/matkul.json"
+CACHE_FILE = "dataset/.ingest_cache.json"
+
+CHUNK_SIZE = 1 << 16       # Ukuran baca per chunk (karakter)
+
+_SKIP = re.compile(r"[\s,]*")
+
+
+# =========================
+# Streaming JSON reader
+# =========================
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Baca elemen top-level JSON array satu per satu tanpa memuat seluruh file.
+    Buffer hanya menyimpan sisa chunk yang belum ter-parse.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        while not buf.strip():
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+
+        pos = _SKIP.match(buf).end()
+        if buf[pos] != "[":
+            raise ValueError(f"{path}: top-level JSON array diharapkan")
+        pos += 1
+        eof = False
+
+        while True:
+            pos = _SKIP.match(buf, pos).end()
+            if pos < len(buf) and buf[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # Elemen yang mentok di ujung buffer bisa saja terpotong
+                complete = end < len(buf) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+
+            if complete:
+                yield item
+                pos = end
+                continue
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+
+# =========================
+# Normalisasi
+# =========================
+def _is_degree(token: str) -> bool:
+    """Token gelar akademik: tiap kata mengandung titik (S.Si., M. Kom.) atau singkatan kapital (MBA)."""
+    words = token.split()
+    return bool(words) and all("." in w or (w.isupper() and len(w) <= 4) for w in words)
+
+
+def split_lecturers(raw: str) -> List[Tuple[str, List[str]]]:
+    """
+    Pecah "Dosen Pengampu" (dipisah koma) menjadi [(nama, [gelar...]), ...].
+    Gelar juga dipisah koma, jadi token gelar menempel ke nama sebelumnya
+    dan token bukan gelar memulai dosen baru.
+    """
+    lecturers: List[Tuple[str, List[str]]] = []
+    for token in raw.split(","):
+        # Rapikan spasi; titik nyasar di awal (mis. "S.E,. M.M.") dibuang
+        token = " ".join(token.split()).lstrip(". ")
+        if not token:
+            continue
+        if lecturers and _is_degree(token):
+            lecturers[-1][1].append(token)
+        else:
+            lecturers.append((token, []))
+    return lecturers
+
+
+class LecturerTable:
+    """Intern nama dosen: variasi penulisan gelar/spasi dari orang yang sama jadi 1 string."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+
+    def intern(self, name: str, degrees: List[str]) -> str:
+        key = name.casefold()
+        if key not in self.names:
+            display = ", ".join([name] + degrees)
+            self.names[key] = sys.intern(display)
+        return self.names[key]
+
+    def reuse(self, display: str) -> str:
+        """Daftarkan nama tampilan yang sudah jadi (dari cache) tanpa parsing ulang."""
+        key = display.split(",", 1)[0].casefold()
+        if key not in self.names:
+            self.names[key] = sys.intern(display)
+        return self.names[key]
+
+
+def row_hash(row: dict) -> str:
+    raw = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def normalize_row(row: dict, lecturers: LecturerTable) -> dict:
+    """Satu baris export registrar -> record matkul (tanpa id)."""
+    return {
+        "kode_mk": row["Kode MK"].strip(),
+        "nama": " ".join(row["Mata Kuliah"].split()),
+        "kelas": row["KELAS"].strip(),
+        "sks": int(str(row["SKS"]).strip()),
+        "dosen": [lecturers.intern(name, degrees) for name, degrees in split_lecturers(row["Dosen Pengampu"])],
+        "prodi": " ".join(row["Program Studi"].split()),
+    }
+
+
+# =========================
+# Pipeline
+# =========================
+def load_cache(path: str) -> dict:
+    """
+    {"sesi": ..., "rows": [hash baris sesuai urutan], "records": {hash: record}}.
+    Cache yang tidak terbaca / format lama dianggap kosong.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache.get("records"), dict) else {}
+
+
+def session_defaults(sesi_file: str) -> Dict[int, List[int]]:
+    """allowed_sessions default per tipe slot (2 = pendek, 3 = panjang) dari sesi.json."""
+    sessions: Dict[int, set] = {}
+    for s in iter_json_array(sesi_file):
+        sessions.setdefault(s["type"], set()).add(s["session"])
+    return {slot_type: sorted(v) for slot_type, v in sessions.items()}
+
+
+def ingest(raw_file=RAW_FILE, output_file=OUTPUT_FILE, sesi_file=SESI_FILE, cache_file=CACHE_FILE):
+    """
+    Compile export mentah registrar menjadi matkul.json untuk solver.
+
+    - Baris dibaca streaming; hanya baris yang berubah sejak import terakhir
+      (berdasarkan hash baris di cache) yang dinormalisasi ulang. Kalau tidak
+      ada yang berubah sama sekali, output lama dipakai tanpa ditulis ulang.
+    - Kelas yang sama (kode, kelas, sks, dosen) yang muncul di beberapa
+      Program Studi digabung menjadi satu kelas dengan beberapa prodi.
+      Baris identik dari prodi yang sama tetap dianggap pertemuan terpisah;
+      baris ke-n sebuah prodi digabung ke pertemuan ke-n kelas tersebut.
+    - Output diurutkan per (kode MK, kelas); id = "<kode_mk>-<kelas>" supaya
+      tetap sama walau section lain ditambah/dihapus (arsip elite me-remap
+      lewat id). Pertemuan ganda dari (kode, kelas) yang sama diberi
+      akhiran "-2", "-3", ... sesuai urutan baris mentah.
+    """
+    allowed_by_type = session_defaults(sesi_file)
+    sesi_key = json.dumps(sorted(allowed_by_type.items()))
+    lecturers = LecturerTable()
+
+    cache = load_cache(cache_file)
+    old_records: Dict[str, dict] = cache.get("records", {})
+
+    # Tahap 1: streaming + hash; hanya baris baru/berubah yang dinormalisasi
+    hashes: List[str] = []
+    fresh: Dict[str, dict] = {}
+    for row in iter_json_array(raw_file):
+        h = row_hash(row)
+        hashes.append(h)
+        if h not in old_records and h not in fresh:
+            fresh[h] = normalize_row(row, lecturers)
+
+    rows = len(hashes)
+    reused = sum(1 for h in hashes if h not in fresh)
+
+    if not fresh and hashes == cache.get("rows") and cache.get("sesi") == sesi_key and os.path.exists(output_file):
+        # Export sama persis dengan import terakhir: tidak perlu merge/sort/tulis ulang
+        print(f"Baris mentah      : {rows}")
+        print(f"Tidak ada perubahan -> {output_file} tidak ditulis ulang")
+        return list(iter_json_array(output_file))
+
+    # Tahap 2: gabung record (nama dosen dari cache dipakai apa adanya)
+    new_records: Dict[str, dict] = {}
+    records: List[dict] = []
+    meetings: Dict[tuple, List[dict]] = {}
+    prodi_rows: Dict[Tuple[tuple, str], int] = {}
+    duplicates = 0
+
+    for h in hashes:
+        rec = new_records.get(h)
+        if rec is None:
+            rec = fresh.get(h)
+            if rec is None:
+                rec = dict(old_records[h])
+                rec["dosen"] = [lecturers.reuse(d) for d in rec["dosen"]]
+            new_records[h] = rec
+
+        key = (rec["kode_mk"], rec["kelas"], rec["sks"], tuple(rec["dosen"]))
+        n = prodi_rows.get((key, rec["prodi"]), 0)
+        prodi_rows[(key, rec["prodi"])] = n + 1
+
+        key_meetings = meetings.setdefault(key, [])
+        if n < len(key_meetings):
+            # Kelas lintas prodi: baris ke-n prodi ini = pertemuan ke-n kelas ini
+            key_meetings[n]["prodi"].append(rec["prodi"])
+            duplicates += 1
+            continue
+
+        mk = {
+            "kode_mk": rec["kode_mk"],
+            "nama": rec["nama"],
+            "kelas": rec["kelas"],
+            "sks": rec["sks"],
+            "dosen": rec["dosen"],
+            "prodi": [rec["prodi"]],
+        }
+        key_meetings.append(mk)
+        records.append(mk)
+
+    # Urut per kode MK lalu kelas (stabil: pertemuan ganda tetap urut baris mentah)
+    records.sort(key=lambda mk: (mk["kode_mk"], mk["kelas"]))
+
+    meeting_count: Dict[Tuple[str, str], int] = {}
+    matkul_list = []
+    for mk in records:
+        section = (mk["kode_mk"], mk["kelas"])
+        meeting_count[section] = meeting_count.get(section, 0) + 1
+        mk_id = f"{mk['kode_mk']}-{mk['kelas']}"
+        if meeting_count[section] > 1:
+            mk_id += f"-{meeting_count[section]}"
+        slot_type = 2 if mk["sks"] == 2 else 3
+        matkul_list.append(
+            {
+                "id": mk_id,
+                "kode_mk": mk["kode_mk"],
+                "nama": mk["nama"],
+                "kelas": mk["kelas"],
+                "sks": mk["sks"],
+                "dosen": mk["dosen"],
+                "allowed_sessions": allowed_by_type.get(slot_type, []),
+                "prodi": mk["prodi"],
+                "groups": student_groups(mk["prodi"], mk["kode_mk"], mk["kelas"]),
+            }
+        )
+
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(matkul_list, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_file, output_file)
+
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump({"sesi": sesi_key, "rows": hashes, "records": new_records}, f, ensure_ascii=False)
+
+    print(f"Baris mentah      : {rows}")
+    print(f"Dari cache        : {reused}")
+    print(f"Diproses ulang    : {rows - reused}")
+    print(f"Digabung (prodi)  : {duplicates}")
+    print(f"Dosen unik        : {len(lecturers.names)}")
+    print(f"Kelas ditulis     : {len(matkul_list)} -> {output_file}")
+
+    return matkul_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile export registrar (jadwalmentah.json) ke matkul.json")
+    parser.add_argument("raw_file", nargs="?", default=RAW_FILE)
+    parser.add_argument("output_file", nargs="?", default=OUTPUT_FILE)
+    parser.add_argument("--sesi", default=SESI_FILE)
+    parser.add_argument("--cache", default=CACHE_FILE)
+    args = parser.parse_args()
+
+    ingest(args.raw_file, args.output_file, args.sesi, args.cache)
+
+
+if __name__ == "__main__":
+    main()
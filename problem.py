@@ -0,0 +1,215 @@
+import math
+from typing import Dict, List, Tuple
+
+
+# =========================
+# Timeslot & overlap waktu
+# =========================
+def parse_minutes(hhmm: str) -> int:
+    """Ubah "HH:MM" menjadi menit sejak 00:00."""
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def compile_timeslots(sesi_list) -> List[dict]:
+    """
+    Bangun daftar timeslot dari sesi.json, lengkap dengan indeks overlap.
+    Dua slot bentrok jika harinya sama dan interval [start, end) beririsan,
+    bukan hanya jika (day, session) persis sama.
+    """
+    timeslots = []
+    for i, s in enumerate(sesi_list):
+        timeslots.append(
+            {
+                "index": i,
+                "day": s["day"],
+                "session": s["session"],
+                "start": s["start"],
+                "end": s["end"],
+                "type": s["type"],  # 3 untuk 3 SKS (panjang), 2 untuk 2 SKS (pendek)
+                "start_min": parse_minutes(s["start"]),
+                "end_min": parse_minutes(s["end"]),
+            }
+        )
+
+    # Daftar slot lain yang overlap, dihitung sekali di sini
+    for ts in timeslots:
+        overlaps = []
+        for other in timeslots:
+            if (
+                other["index"] != ts["index"]
+                and other["day"] == ts["day"]
+                and other["start_min"] < ts["end_min"]
+                and ts["start_min"] < other["end_min"]
+            ):
+                overlaps.append(other["index"])
+        ts["overlaps"] = tuple(overlaps)
+
+    return timeslots
+
+
+def count_clashes(used: Dict[Tuple[int, str], List[int]], timeslots) -> int:
+    """
+    Hitung jumlah bentrok dari pemakaian resource per (timeslot_index, resource).
+    Slot yang sama: kelas ke-2 dst dihitung 1 bentrok (seperti sebelumnya).
+    Slot berbeda yang overlap: tiap pasangan kelas dihitung 1 bentrok.
+    """
+    clashes = 0
+    for (ts_index, resource), kelas_idx in used.items():
+        n = len(kelas_idx)
+        if n == 0:
+            continue
+        if n > 1:
+            clashes += n - 1
+        for other in timeslots[ts_index]["overlaps"]:
+            if other > ts_index:
+                clashes += n * len(used.get((other, resource), ()))
+    return clashes
+
+
+# =========================
+# Kelompok mahasiswa (Program Studi + semester + KELAS)
+# =========================
+def cohort(kode_mk: str) -> str:
+    """
+    Semester mata kuliah dari digit ke-7 Kode MK (mis. IF2514101 -> "1", IF2514701 -> "7").
+    Digit 0 berarti prodi tidak meng-encode semester -> "" (tidak diketahui).
+    """
+    digit = kode_mk[6:7]
+    return digit if digit.isdigit() and digit != "0" else ""
+
+
+def group_name(prodi: str, semester: str, kelas: str) -> str:
+    """Nama kelompok mahasiswa: "<Program Studi>-S<semester>-<KELAS>"."""
+    return f"{prodi}-S{semester}-{kelas}"
+
+
+def student_groups(prodi_list, kode_mk: str, kelas: str) -> List[str]:
+    """
+    Kelompok mahasiswa yang mengambil kelas ini. Kalau semester tidak bisa
+    dibaca dari Kode MK, tidak ada kelompok yang dibentuk: menggabungkan
+    semua semester satu prodi membuat bentrok palsu yang tidak bisa dihindari.
+    """
+    semester = cohort(kode_mk)
+    if not semester:
+        return []
+    return [group_name(prodi, semester, kelas) for prodi in prodi_list]
+
+
+def attach_student_groups(matkul_list, jadwal_mentah) -> None:
+    """
+    Isi mk["groups"] (lihat student_groups).
+    Program studi diambil dari jadwalmentah.json lewat (Kode MK, KELAS).
+    """
+    prodi_index: Dict[Tuple[str, str], List[str]] = {}
+    for row in jadwal_mentah:
+        key = (row["Kode MK"], row["KELAS"])
+        prodi_list = prodi_index.setdefault(key, [])
+        if row["Program Studi"] not in prodi_list:
+            prodi_list.append(row["Program Studi"])
+
+    for mk in matkul_list:
+        if "groups" in mk:
+            continue
+        prodi_list = prodi_index.get((mk["kode_mk"], mk["kelas"]), [])
+        mk["groups"] = student_groups(prodi_list, mk["kode_mk"], mk["kelas"])
+
+
+# =========================
+# Lower bound penalty
+# =========================
+def soft_penalty(mk, ts) -> int:
+    """Penalty soft constraint satu kelas di timeslot ts"""
+    penalty = 0
+    if ts["session"] not in mk["allowed_sessions"]:
+        penalty += 5
+    if mk["sks"] == 2 and ts["type"] != 2:
+        penalty += 3
+    if mk["sks"] >= 3 and ts["type"] != 3:
+        penalty += 3
+    return penalty
+
+
+def _max_assignment(class_slots: List[List[int]], capacity: int) -> int:
+    """Maximum matching kelas -> slot (tiap slot muat `capacity` kelas), augmenting path."""
+    assigned: Dict[int, List[int]] = {}
+
+    def augment(c, visited) -> bool:
+        for s in class_slots[c]:
+            if s in visited:
+                continue
+            visited.add(s)
+            holders = assigned.setdefault(s, [])
+            if len(holders) < capacity:
+                holders.append(c)
+                return True
+            for k, other in enumerate(holders):
+                if augment(other, visited):
+                    holders[k] = c
+                    return True
+        return False
+
+    return sum(1 for c in range(len(class_slots)) if augment(c, set()))
+
+
+def compute_lower_bound(timeslots, ruang_list, matkul_list) -> int:
+    """
+    Penalty minimum yang tidak mungkin dihindari, dari argumen counting.
+
+    Untuk tiap resource (dosen, kelompok mahasiswa, pool ruang) hanya
+    sebanyak maximum matching kelas -> slot tanpa soft penalty yang bisa
+    dijadwalkan gratis. Sisanya pasti kena bentrok resource itu atau
+    soft penalty karena keluar dari slot yang diizinkan. Soft penalty
+    dibagi rata ke resource kelas tersebut agar tidak dihitung ganda.
+    """
+    zero_slots = []
+    soft_outside = []
+    for mk in matkul_list:
+        costs = [soft_penalty(mk, ts) for ts in timeslots]
+        zero_slots.append([ts["index"] for ts, c in zip(timeslots, costs) if c == 0])
+        outside = [c for c in costs if c > 0]
+        soft_outside.append(min(outside) if outside else float("inf"))
+
+    kelas_dosen: Dict[str, List[int]] = {}
+    kelas_group: Dict[str, List[int]] = {}
+    for i, mk in enumerate(matkul_list):
+        for d in mk["dosen"]:
+            kelas_dosen.setdefault(d, []).append(i)
+        for g in mk["groups"]:
+            kelas_group.setdefault(g, []).append(i)
+
+    # (kelas, kapasitas per slot, bobot bentrok, nama family)
+    resources = [(kelas, 1, 8, "dosen") for kelas in kelas_dosen.values()]
+    resources += [(kelas, 1, 8, "group") for kelas in kelas_group.values()]
+    resources.append((list(range(len(matkul_list))), len(set(ruang_list)), 10, "room"))
+
+    excess = []
+    for kelas, capacity, weight, family in resources:
+        n_excess = len(kelas) - _max_assignment([zero_slots[i] for i in kelas], capacity)
+        excess.append((kelas, weight, family, n_excess))
+
+    def family_bound(families) -> float:
+        def num_resources(i):
+            mk = matkul_list[i]
+            return (
+                ("dosen" in families) * len(mk["dosen"])
+                + ("group" in families) * len(mk["groups"])
+                + ("room" in families)
+            )
+
+        total = 0.0
+        for kelas, weight, family, n_excess in excess:
+            if family not in families or n_excess <= 0:
+                continue
+            costs = sorted(min(weight, soft_outside[i] / num_resources(i)) for i in kelas)
+            total += sum(costs[:n_excess])
+        return total
+
+    bound = max(
+        family_bound({"dosen", "group", "room"}),
+        family_bound({"dosen"}),
+        family_bound({"group"}),
+        family_bound({"room"}),
+    )
+    # Penalty selalu bilangan bulat
+    return math.ceil(bound - 1e-9)
@@ -0,0 +1,315 @@
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+# Semua array disimpan sebagai int32 ("i") berurutan dalam satu blok shared memory
+ITEM_SIZE = 4
+
+# Urutan atribut per timeslot di array slot_attrs
+SLOT_FIELDS = ("day", "session", "type", "start_min", "end_min")
+
+
+# =========================
+# Attach
+# =========================
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Buka shared memory milik proses pembuat. Unlink tetap tanggung jawab pembuat;
+    worker multiprocessing berbagi resource tracker dengan pembuatnya, jadi
+    registrasi ulang saat attach tidak membuat blok di-unlink lebih awal.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _csr(rows: List[List[int]]) -> Tuple[List[int], List[int]]:
+    """List of list -> (ptr, idx) format CSR."""
+    ptr = [0]
+    idx = []
+    for row in rows:
+        idx.extend(row)
+        ptr.append(len(idx))
+    return ptr, idx
+
+
+# =========================
+# Data masalah terkompilasi
+# =========================
+class SharedProblem:
+    """
+    Data masalah terkompilasi (atribut slot, kandidat slot per kelas,
+    adjacency CSR dosen/kelompok) di satu blok multiprocessing.shared_memory.
+    Worker cukup menerima (name, layout) lalu attach tanpa copy/pickle data.
+
+    Pembuat blok memanggil close() + unlink(); worker cukup close().
+    Dipakai sebagai context manager oleh pembuatnya.
+    """
+
+    def __init__(self, shm, layout: Dict[str, Tuple[int, int]], owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self._views = {}
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, timeslots, ruang_list, matkul_list) -> "SharedProblem":
+        day_ids: Dict[str, int] = {}
+        room_ids: Dict[str, int] = {}
+        dosen_ids: Dict[str, int] = {}
+        group_ids: Dict[str, int] = {}
+
+        slot_attrs = []
+        for ts in timeslots:
+            slot_attrs += [
+                day_ids.setdefault(ts["day"], len(day_ids)),
+                ts["session"],
+                ts["type"],
+                ts["start_min"],
+                ts["end_min"],
+            ]
+        overlap_ptr, overlap_idx = _csr([list(ts["overlaps"]) for ts in timeslots])
+
+        # Nama ruang yang sama (mis. B102 ganda) = ruang yang sama
+        room_name = [room_ids.setdefault(room, len(room_ids)) for room in ruang_list]
+
+        candidate_rows = []
+        for mk in matkul_list:
+            allowed = [ts for ts in timeslots if ts["session"] in mk["allowed_sessions"]]
+            if mk["sks"] == 2:
+                allowed = [ts for ts in allowed if ts["type"] == 2]
+            else:
+                allowed = [ts for ts in allowed if ts["type"] == 3]
+            candidate_rows.append([ts["index"] for ts in (allowed or timeslots)])
+        candidate_ptr, candidate_idx = _csr(candidate_rows)
+
+        session_ptr, session_idx = _csr([list(mk["allowed_sessions"]) for mk in matkul_list])
+
+        kelas_dosen = [[dosen_ids.setdefault(d, len(dosen_ids)) for d in mk["dosen"]] for mk in matkul_list]
+        kelas_group = [[group_ids.setdefault(g, len(group_ids)) for g in mk["groups"]] for mk in matkul_list]
+        dosen_ptr, dosen_idx = _csr(kelas_dosen)
+        group_ptr, group_idx = _csr(kelas_group)
+
+        # Adjacency terbalik: dosen -> kelas (untuk graf konflik)
+        dosen_kelas = [[] for _ in dosen_ids]
+        for i, row in enumerate(kelas_dosen):
+            for d in row:
+                dosen_kelas[d].append(i)
+        dosen_kelas_ptr, dosen_kelas_idx = _csr(dosen_kelas)
+
+        # Kelas per tipe sks: baris 0 = selain 2 sks, baris 1 = 2 sks (untuk move swap)
+        type_kelas = [[], []]
+        for i, mk in enumerate(matkul_list):
+            type_kelas[mk["sks"] == 2].append(i)
+        type_kelas_ptr, type_kelas_idx = _csr(type_kelas)
+
+        arrays = {
+            "slot_attrs": slot_attrs,
+            "overlap_ptr": overlap_ptr,
+            "overlap_idx": overlap_idx,
+            "room_name": room_name,
+            "sks": [mk["sks"] for mk in matkul_list],
+            "candidate_ptr": candidate_ptr,
+            "candidate_idx": candidate_idx,
+            "session_ptr": session_ptr,
+            "session_idx": session_idx,
+            "dosen_ptr": dosen_ptr,
+            "dosen_idx": dosen_idx,
+            "group_ptr": group_ptr,
+            "group_idx": group_idx,
+            "dosen_kelas_ptr": dosen_kelas_ptr,
+            "dosen_kelas_idx": dosen_kelas_idx,
+            "type_kelas_ptr": type_kelas_ptr,
+            "type_kelas_idx": type_kelas_idx,
+        }
+
+        layout = {}
+        offset = 0
+        for field, values in arrays.items():
+            layout[field] = (offset, len(values))
+            offset += len(values)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1) * ITEM_SIZE)
+        problem = cls(shm, layout, owner=True)
+        for field, values in arrays.items():
+            view = problem.array(field)
+            for k, v in enumerate(values):
+                view[k] = v
+        return problem
+
+    @classmethod
+    def attach(cls, name: str, layout: Dict[str, Tuple[int, int]]) -> "SharedProblem":
+        return cls(_attach(name), layout, owner=False)
+
+    def array(self, field: str) -> memoryview:
+        """View int32 (zero-copy) ke salah satu array."""
+        if field not in self._views:
+            offset, length = self.layout[field]
+            start = offset * ITEM_SIZE
+            self._views[field] = self.shm.buf[start:start + length * ITEM_SIZE].cast("i")
+        return self._views[field]
+
+    def row(self, field: str, i: int) -> memoryview:
+        """Baris ke-i dari array CSR `field` (pasangan <field>_ptr / <field>_idx)."""
+        ptr = self.array(f"{field}_ptr")
+        return self.array(f"{field}_idx")[ptr[i]:ptr[i + 1]]
+
+    def solver_views(self):
+        """
+        (timeslots, ruang_list, matkul_list, index) untuk SA, berupa view read-only
+        yang membaca shared memory langsung (tanpa membangun ulang dict/list).
+        Bentuknya sama dengan data SA biasa: timeslots[t]["overlaps"],
+        matkul_list[i]["dosen"], index["allowed_slots"][i], dst.
+        Nama dosen/kelompok/ruang/hari diganti id integer (hanya dipakai sebagai key).
+        Blok harus tetap ter-attach selama view dipakai.
+        """
+        attrs = self.array("slot_attrs")
+        width = len(SLOT_FIELDS)
+        overlaps = _Rows(self, "overlap")
+
+        slot_columns = {"index": lambda t: t, "overlaps": overlaps.__getitem__}
+        for k, field in enumerate(SLOT_FIELDS):
+            slot_columns[field] = lambda t, k=k: attrs[t * width + k]
+        timeslots = _Table(len(overlaps), slot_columns)
+
+        sks = self.array("sks")
+        matkul_list = _Table(
+            len(sks),
+            {
+                "sks": sks.__getitem__,
+                "allowed_sessions": _Rows(self, "session").__getitem__,
+                "dosen": _Rows(self, "dosen").__getitem__,
+                "groups": _Rows(self, "group").__getitem__,
+            },
+        )
+
+        index = {
+            "allowed_slots": _Rows(self, "candidate"),
+            "lecturer": _Rows(self, "dosen_kelas"),
+            "same_type": _Rows(self, "type_kelas"),
+        }
+
+        return timeslots, self.array("room_name"), matkul_list, index
+
+    def close(self):
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+
+# =========================
+# View read-only untuk solver
+# =========================
+class _Rows:
+    """rows[i] = baris ke-i array CSR `field` sebagai memoryview (tanpa copy)."""
+
+    def __init__(self, problem: SharedProblem, field: str):
+        self.ptr = problem.array(f"{field}_ptr")
+        self.idx = problem.array(f"{field}_idx")
+
+    def __len__(self) -> int:
+        return len(self.ptr) - 1
+
+    def __getitem__(self, i) -> memoryview:
+        i = int(i)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.idx[self.ptr[i]:self.ptr[i + 1]]
+
+
+class _Table:
+    """Sequence record: table[i][key] dihitung oleh columns[key](i) saat diakses."""
+
+    def __init__(self, length: int, columns):
+        self.length = length
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, i) -> "_Record":
+        if not 0 <= i < self.length:
+            raise IndexError(i)
+        return _Record(self.columns, i)
+
+
+class _Record:
+    __slots__ = ("columns", "i")
+
+    def __init__(self, columns, i: int):
+        self.columns = columns
+        self.i = i
+
+    def __getitem__(self, key):
+        return self.columns[key](self.i)
+
+
+# =========================
+# Buffer populasi
+# =========================
+class SharedPopulation:
+    """
+    Buffer kromosom (rows x L gen, tiap gen = timeslot, ruang) di shared memory,
+    supaya individu bisa ditukar dengan worker lewat index baris saja.
+    """
+
+    def __init__(self, shm, rows: int, length: int, owner: bool):
+        self.shm = shm
+        self.rows = rows
+        self.length = length
+        self.owner = owner
+        self.genes = shm.buf[:rows * length * 2 * ITEM_SIZE].cast("i")
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, rows: int, length: int) -> "SharedPopulation":
+        shm = shared_memory.SharedMemory(create=True, size=max(rows * length * 2, 1) * ITEM_SIZE)
+        return cls(shm, rows, length, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, rows: int, length: int) -> "SharedPopulation":
+        return cls(_attach(name), rows, length, owner=False)
+
+    def read(self, row: int) -> List[Tuple[int, int]]:
+        flat = self.genes[row * self.length * 2:(row + 1) * self.length * 2]
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def write(self, row: int, individual) -> None:
+        base = row * self.length * 2
+        for k, (ts_index, room_index) in enumerate(individual):
+            self.genes[base + 2 * k] = ts_index
+            self.genes[base + 2 * k + 1] = room_index
+
+    def close(self):
+        self.genes.release()
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()